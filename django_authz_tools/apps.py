@@ -1,16 +1,43 @@
+from collections.abc import Iterable
+from types import ModuleType
+from typing import Any
+
 from django.apps import AppConfig
+from django.conf import settings as django_settings
 
 from django_authz_tools import consts
-from django_authz_tools.helpers.var_parser import parse_module_attrs, ParsingOptions
+from django_authz_tools.helpers.var_parser import ObjInfo, parse_consts_from_module
+
+
+def _get_wrapped_settings() -> Any:
+    """
+    Get the settings object hidden behind django.conf.settings lazy wrapper.
+    """
+
+    if not django_settings.configured:
+        django_settings._setup()
+    return django_settings._wrapped
+
 
-def load_missed_values_into_settings():
+def add_consts_to_settings(objs_info: Iterable[ObjInfo]) -> None:
+    """
+    Add constants to settings in one pass, skipping already set ones.
+    """
 
-    default_settings = {
-        const: getattr(const, )
-        for const
-        in parse_module_attrs(module=consts, )
-        if not hasattr(settings)
-    }
+    settings_dict = _get_wrapped_settings().__dict__
+    settings_dict.update({const.name: const.value for const in objs_info if const.name not in settings_dict})
+
+
+def load_missed_consts_from_module_into_settings(module: ModuleType) -> None:
+    """
+    Add public constants of the module to settings,
+    unless settings with such names are already configured.
+    """
+
+    configured_names = frozenset(dir(_get_wrapped_settings()))
+    add_consts_to_settings(
+        const for const in parse_consts_from_module(module) if const.name not in configured_names
+    )
 
 
 def set_group_and_permission_models_into_settings():
@@ -19,7 +46,11 @@ def set_group_and_permission_models_into_settings():
 
 
 class StartupAppConfig(AppConfig):
-    name = "django_custom_groups"
+    name = "django_authz_tools"
 
     def ready(self):  # on startup
-        load_missed_values_into_settings()
+        load_missed_consts_from_module_into_settings(module=consts)
+
+        from django_authz_tools.signals import connect_signals
+
+        connect_signals()
@@ -1,7 +1,146 @@
+from collections.abc import Iterable, Iterator, Set
+from functools import cached_property, lru_cache
+from typing import Any, TypeVar
+
 from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Permission as DefaultPermission
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import Q, prefetch_related_objects
+
+from django_authz_tools.helpers.model_utils import get_permission_model
+from django_authz_tools.helpers.request_cache import cache_for_request, clear_request_cache
 
 
 UserModel = get_user_model()
+PermissionModel = get_permission_model()
+
+_T = TypeVar("_T")
+
+
+@lru_cache(maxsize=None)
+def _get_perms_to_users_lookups(user_model) -> dict[str, str]:
+    # Only for relations of the user model which aren't disabled by mixins.
+    relations = {field.name: field for field in user_model._meta.many_to_many}
+    lookups = {}
+    if "user_permissions" in relations:
+        lookups["user_permissions"] = relations["user_permissions"].related_query_name()
+    if "groups" in relations:
+        groups = relations["groups"]
+        # Reverse name of group's permissions depends on the group model.
+        group_permissions = groups.related_model._meta.get_field("permissions")
+        lookups["groups"] = f"{group_permissions.related_query_name()}__{groups.related_query_name()}"
+    return lookups
+
+
+_PERMS_TO_USERS_LOOKUPS = _get_perms_to_users_lookups(UserModel)  # relation name -> lookup from permission
+_PREFETCH_LOOKUPS = {"user_permissions": "user_permissions", "groups": "groups__permissions"}
+
+
+def prefetch_user_perms(user_obj) -> None:
+    """
+    Load groups and permissions of the user with constant number of queries.
+    After that ModelBackend answers permission checks for this user from memory.
+
+    Useful when user's groups and permissions are needed anyway, e.g. in views
+    rendering them. Repeated calls for the same user object are no-ops.
+    Users fetched with PrefetchUserManager.with_perms_graph() don't need it.
+    """
+
+    if getattr(user_obj, "_perms_prefetched", False):
+        return
+    # Relations disabled by mixins can't be prefetched.
+    relation_names = _get_perms_to_users_lookups(type(user_obj))
+    prefetch_related_objects([user_obj], *(_PREFETCH_LOOKUPS[name] for name in relation_names))
+    user_obj._perms_prefetched = True
+
+
+def clear_perm_cache(user_obj) -> None:
+    """
+    Forget permissions cached for the user, e.g. after they've been changed.
+    """
+
+    cache_names = (
+        "_user_perm_cache", "_group_perm_cache", "_all_perm_cache", "_perms_prefetched",
+        "_is_staff_cache", "_is_superuser_cache",
+    )
+    for cache_name in cache_names:
+        user_obj.__dict__.pop(cache_name, None)
+    clear_request_cache()
+
+
+def refresh_effective_perms(user_obj) -> None:
+    """
+    Recompute denormalized effective_perms of the user and store them,
+    without touching other columns of the user.
+    """
+
+    perms = _compute_effective_perms({user_obj.pk})[user_obj.pk]
+    user_obj.effective_perms = perms
+    type(user_obj)._default_manager.filter(pk=user_obj.pk).update(effective_perms=perms)
+    clear_perm_cache(user_obj)
+
+
+def refresh_users_effective_perms(user_pks: Iterable) -> None:
+    """
+    Recompute denormalized effective_perms of users with given pks and store them.
+    Takes constant number of queries regardless of amount of users.
+    """
+
+    user_pks = set(user_pks)
+    if not user_pks:
+        return
+    users = [UserModel(pk=pk, effective_perms=perms) for pk, perms in _compute_effective_perms(user_pks).items()]
+    UserModel._default_manager.bulk_update(users, ["effective_perms"])
+    clear_request_cache()
+
+
+def _compute_effective_perms(user_pks: set) -> dict[Any, list[str]]:
+    # Always from the database: prefetched permissions may be stale or filtered.
+    perms: dict[Any, set[str]] = {pk: set() for pk in user_pks}
+    for lookup in _PERMS_TO_USERS_LOOKUPS.values():
+        rows = PermissionModel.objects.filter(**{f"{lookup}__in": user_pks}).values_list(
+            lookup, "content_type__app_label", "codename"
+        )
+        for pk, app_label, codename in rows.order_by():
+            perms[pk].add(f"{app_label}.{codename}")
+    return {pk: sorted(names) for pk, names in perms.items()}
+
+
+def _is_prefetched(obj, relation_name: str) -> bool:
+    return relation_name in getattr(obj, "_prefetched_objects_cache", {})
+
+
+def _perm_natural_name(perm) -> tuple[str, str]:
+    # ContentType manager caches content types by id, so no query per permission.
+    content_type = ContentType.objects.get_for_id(perm.content_type_id)
+    return content_type.app_label, perm.codename
+
+
+class AllPermissionsSet(Set):
+    """
+    Set of all permissions, used for superusers.
+
+    Membership checks are answered without touching the database,
+    permissions are loaded only when the set is iterated.
+    """
+
+    def __contains__(self, perm: object) -> bool:
+        return True
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._perms)
+
+    def __len__(self) -> int:
+        return len(self._perms)
+
+    @classmethod
+    def _from_iterable(cls, it: Iterable[_T]) -> set[_T]:
+        return set(it)
+
+    @cached_property
+    def _perms(self) -> set[str]:
+        perms = PermissionModel.objects.values_list("content_type__app_label", "codename").order_by()
+        return {f"{ct}.{name}" for ct, name in perms}
 
 
 class BaseBackend:
@@ -11,13 +150,13 @@ class BaseBackend:
     def get_user(self, user_id):
         return None
 
-    def get_user_permissions(self, user_obj, obj=None) -> set:
+    def get_user_permissions(self, user_obj, obj=None) -> Set[str]:
         return set()
 
-    def get_group_permissions(self, user_obj, obj=None) -> set:
+    def get_group_permissions(self, user_obj, obj=None) -> Set[str]:
         return set()
 
-    def get_all_permissions(self, user_obj, obj=None) -> set[]:
+    def get_all_permissions(self, user_obj, obj=None) -> Set[str]:
         return {
             *self.get_user_permissions(user_obj, obj=obj),
             *self.get_group_permissions(user_obj, obj=obj),
@@ -25,3 +164,143 @@ class BaseBackend:
 
     def has_perm(self, user_obj, perm, obj=None) -> bool:
         return perm in self.get_all_permissions(user_obj, obj=obj)
+
+
+class ModelBackend(BaseBackend):
+    """
+    Authorizes users against the permission model configured for this project.
+
+    Computed permissions are cached on the user object and for the rest of
+    the current request, so repeated checks for the same user don't hit
+    the database again, even with different instances of that user.
+    For user models with effective_perms column, permission checks are
+    answered from the user row itself.
+    """
+
+    def get_user(self, user_id):
+        try:
+            user = UserModel._default_manager.get(pk=user_id)
+        except UserModel.DoesNotExist:
+            return None
+        return user if self.user_can_authenticate(user) else None
+
+    def user_can_authenticate(self, user) -> bool:
+        return getattr(user, "is_active", True)
+
+    def _get_user_permissions(self, user_obj) -> Iterable[tuple[str, str]]:
+        if getattr(user_obj, "user_permissions", None) is None:
+            return ()  # disabled by NoUserPermissionsMixin
+        if _is_prefetched(user_obj, "user_permissions"):
+            return (_perm_natural_name(perm) for perm in user_obj.user_permissions.all())
+        return self._query_user_permissions(user_obj)
+
+    def _get_group_permissions(self, user_obj) -> Iterable[tuple[str, str]]:
+        if getattr(user_obj, "groups", None) is None:
+            return ()  # disabled by NoGroupsMixin
+        if _is_prefetched(user_obj, "groups") and all(
+            _is_prefetched(group, "permissions") for group in user_obj.groups.all()
+        ):
+            return (
+                _perm_natural_name(perm)
+                for group in user_obj.groups.all()
+                for perm in group.permissions.all()
+            )
+        return self._query_group_permissions(user_obj)
+
+    def _query_user_permissions(self, user_obj) -> Iterable[tuple[str, str]]:
+        return self._query_permissions(user_obj, "user_permissions")
+
+    def _query_group_permissions(self, user_obj) -> Iterable[tuple[str, str]]:
+        return self._query_permissions(user_obj, "groups")
+
+    def _query_permissions(self, user_obj, relation_name: str) -> Iterable[tuple[str, str]]:
+        lookup = _get_perms_to_users_lookups(type(user_obj)).get(relation_name)
+        if lookup is None or user_obj.pk is None:
+            return ()
+        perms = PermissionModel.objects.filter(**{lookup: user_obj.pk})
+        return perms.values_list("content_type__app_label", "codename").order_by()
+
+    @cache_for_request
+    def _get_permissions(self, user_obj, obj, from_name: str) -> Set[str]:
+        """
+        Return the permissions of user_obj from from_name,
+        which is either "user" or "group".
+        """
+
+        if not user_obj.is_active or user_obj.is_anonymous or obj is not None:
+            return set()
+
+        perm_cache_name = f"_{from_name}_perm_cache"
+        if not hasattr(user_obj, perm_cache_name):
+            if user_obj.is_superuser:
+                perms: Set[str] = AllPermissionsSet()
+            else:
+                natural_names = getattr(self, f"_get_{from_name}_permissions")(user_obj)
+                perms = {f"{ct}.{name}" for ct, name in natural_names}
+            setattr(user_obj, perm_cache_name, perms)
+        return getattr(user_obj, perm_cache_name)
+
+    def get_user_permissions(self, user_obj, obj=None) -> Set[str]:
+        return self._get_permissions(user_obj, obj, "user")
+
+    def get_group_permissions(self, user_obj, obj=None) -> Set[str]:
+        return self._get_permissions(user_obj, obj, "group")
+
+    @cache_for_request
+    def get_all_permissions(self, user_obj, obj=None) -> Set[str]:
+        if not user_obj.is_active or user_obj.is_anonymous or obj is not None:
+            return set()
+        if not hasattr(user_obj, "_all_perm_cache"):
+            if user_obj.is_superuser:
+                user_obj._all_perm_cache = AllPermissionsSet()
+            elif getattr(user_obj, "effective_perms", None) is not None:
+                user_obj._all_perm_cache = set(user_obj.effective_perms)
+            else:
+                user_obj._all_perm_cache = super().get_all_permissions(user_obj)
+        return user_obj._all_perm_cache
+
+    def has_perm(self, user_obj, perm, obj=None) -> bool:
+        if not user_obj.is_active:
+            return False
+        if user_obj.is_superuser and obj is None:
+            return True
+        return super().has_perm(user_obj, perm, obj=obj)
+
+    def with_perm(self, perm, is_active=True, include_superusers=True, obj=None):
+        """
+        Return users that have permission "perm". By default, filter out
+        inactive users and include superusers.
+        """
+
+        if isinstance(perm, PermissionModel):
+            perm_filters = Q(pk=perm.pk)
+        else:
+            if isinstance(perm, DefaultPermission):
+                # Instance of other permission table, its pk means nothing here.
+                perm = f"{perm.content_type.app_label}.{perm.codename}"
+            elif not isinstance(perm, str):
+                raise TypeError(
+                    "The `perm` argument must be a string or a permission instance."
+                )
+            try:
+                app_label, codename = perm.split(".")
+            except ValueError:
+                raise ValueError(
+                    "Permission name should be in the form "
+                    "app_label.permission_codename."
+                )
+            perm_filters = Q(codename=codename, content_type__app_label=app_label)
+
+        if obj is not None:
+            return UserModel._default_manager.none()
+
+        perms = PermissionModel.objects.filter(perm_filters)
+        user_q = Q(pk__in=[])  # relations may be disabled by mixins, then only superusers match
+        for lookup in _PERMS_TO_USERS_LOOKUPS.values():
+            user_q |= Q(pk__in=perms.values(lookup))
+        if include_superusers:
+            user_q |= Q(is_superuser=True)
+        if is_active is not None:
+            user_q &= Q(is_active=is_active)
+
+        return UserModel._default_manager.filter(user_q)
@@ -1,5 +1,6 @@
 DEFAULT_SUPERUSER_GROUP_NAME = "system.superusers"
 DEFAULT_STAFF_GROUP_NAME = "system.staff_users"
+AUTHZ_PERM_FILTER = None  # app label(s) or callable(queryset) limiting with_perms_graph(), display only
 _abgd = ""
 __bcde = 11
 
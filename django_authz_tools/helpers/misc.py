@@ -1,13 +1,18 @@
 from typing import Any
 
 
+_MISSING = object()
+
+
 def has_not_empty(obj: Any, attr_name: str) -> bool:
-    return hasattr(obj, attr_name) and getattr(obj, attr_name)
+    value = getattr(obj, attr_name, _MISSING)
+    return value is not _MISSING and bool(value)
 
 
 def has_empty(obj: Any, attr_name: str) -> bool:
-    return hasattr(obj, attr_name) and not getattr(obj, attr_name)
+    value = getattr(obj, attr_name, _MISSING)
+    return value is not _MISSING and not value
 
 
 def get_if_exists(obj: Any, attr_name: str) -> Any | None:
-    return getattr(obj, attr_name) if hasattr(obj, attr_name) else None
+    return getattr(obj, attr_name, None)
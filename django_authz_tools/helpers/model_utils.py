@@ -1,62 +1,122 @@
+from collections.abc import Iterable
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import AbstractBaseUser
-from django.db.models.fields.related import ManyToManyField
-from django.core.exceptions import ImproperlyConfigured
+from django.db import models
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
+
+from django_authz_tools.exceptions import ModelIsNotAbstractException
+from django_authz_tools.models.base import GROUP_TYPES, PERMISSION_TYPES
+from django_authz_tools.models.managers import _sync_groups_by_names
 
-from django_authz_tools.models.base import Group, Permission
+if TYPE_CHECKING:
+    from django_authz_tools.models.base import Group, Permission
 
 
-def get_group_model() -> type[Group]:
+@lru_cache(maxsize=1)
+def get_group_model() -> "type[Group]":
     """
     Get group model class set for this project.
+
+    Result is cached, as app registry doesn't change after startup.
+    Use get_group_model.cache_clear() to reset it, e.g. in tests.
     """
 
     user_model: type[AbstractBaseUser] = get_user_model()
-    groups: ManyToManyField | None = getattr(user_model, "groups")
-    if not groups:
+    try:
+        group_model = user_model._meta.get_field("groups").related_model
+    except FieldDoesNotExist:
         raise ImproperlyConfigured(
             f"User model {user_model} configured with AUTH_USER_MODEL "
             f"doesn't have 'groups' field."
         )
-    if not issubclass(groups.model, Group):
+    if not issubclass(group_model, GROUP_TYPES):
         raise ImproperlyConfigured(
-            f"User model configured with AUTH_USER_MODEL "
+            f"Group model of user model configured with AUTH_USER_MODEL "
             f"haven't been inherited from AbstractGroup."
         )
-    return groups.model
+    return group_model
 
 
-def get_permission_model() -> type[Permission]:
+@lru_cache(maxsize=1)
+def get_permission_model() -> "type[Permission]":
     """
     Get permission model class set for this project.
+
+    Result is cached, as app registry doesn't change after startup.
+    Use get_permission_model.cache_clear() to reset it, e.g. in tests.
     """
 
     group_model = get_group_model()
-    permissions: ManyToManyField | None = getattr(group_model, "permissions")
-    if not permissions:
+    try:
+        permission_model = group_model._meta.get_field("permissions").related_model
+    except FieldDoesNotExist:
         raise ImproperlyConfigured(
             f"Group model configured with AUTH_USER_MODEL "
             f"doesn't have 'permissions' field."
         )
-    if not issubclass(permissions.model, Permission):
+    if not issubclass(permission_model, PERMISSION_TYPES):
         raise ImproperlyConfigured(
             f"Permission model configured with AUTH_USER_MODEL "
             f"haven't been inherited from AbstractPermission."
         )
-    return permissions.model
+    return permission_model
 
 
-def get_or_create_groups(names: Iterable[str]) -> list[Group]:
+def get_or_create_groups(names: Iterable[str]) -> "list[Group]":
     """
     Create groups with given names if there are no such already.
+    Takes constant number of queries regardless of amount of names.
     """
 
-    group_model = get_group_model()
-    return [group_model.objects.get_or_create(name=name)[0] for name in names]
+    return list(_sync_groups_by_names(get_group_model().objects, names))
+
 
+_concrete_models: dict[tuple, tuple[dict, type[models.Model]]] = {}
 
-def from_abstract_to_concrete(cls: models.Model) -> models.Model:
+
+def from_abstract_to_concrete_model(
+    abstract_model: type[models.Model],
+    new_model_name: str,
+    field_overrides: dict[str, models.Field] | None = None,
+    app_label: str | None = None,
+) -> type[models.Model]:
     """
-    Make abstract model concrete.
+    Make concrete model from the abstract one, optionally overriding its fields.
+    Model is put into app_label app, by default the one of abstract model.
+    Repeated calls with the same arguments return the same model class,
+    overrides are compared by their deconstruction, not by Field identity.
     """
-    pass
+
+    if not abstract_model._meta.abstract:
+        raise ModelIsNotAbstractException(f"Model {abstract_model} is not abstract.")
+
+    field_overrides = field_overrides or {}
+    app_label = app_label or abstract_model._meta.app_label
+    # Fields compare by creation order, so equal fresh ones would never match.
+    # Deconstructions may hold unhashable values, so they are compared, not hashed.
+    overrides_key = {name: field.deconstruct()[1:] for name, field in field_overrides.items()}
+    key = (abstract_model, new_model_name, app_label)
+    if key in _concrete_models and _concrete_models[key][0] == overrides_key:
+        return _concrete_models[key][1]
+
+    concrete_model = _make_concrete_model(abstract_model, new_model_name, field_overrides, app_label)
+    _concrete_models[key] = (overrides_key, concrete_model)
+    return concrete_model
+
+
+def _make_concrete_model(
+    abstract_model: type[models.Model],
+    new_model_name: str,
+    field_overrides: dict[str, models.Field],
+    app_label: str | None,
+) -> type[models.Model]:
+    # Fields of abstract parent are copied by Django's ModelBase itself,
+    # so only overrides are passed, no need to collect parent's fields.
+    attrs = {"__module__": abstract_model.__module__, **field_overrides}
+    if app_label is not None:
+        # Explicit app_label saves app registry scan by the model's module.
+        attrs["Meta"] = type("Meta", (abstract_model.Meta,), {"app_label": app_label})
+    return type(new_model_name, (abstract_model,), attrs)
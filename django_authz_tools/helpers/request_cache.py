@@ -0,0 +1,53 @@
+from functools import wraps
+from typing import Any, Callable
+
+from asgiref.local import Local
+from django.core.signals import request_finished, request_started
+from django.dispatch import receiver
+
+
+_storage = Local()
+
+
+@receiver(request_started)
+def _start_request_cache(**kwargs) -> None:
+    _storage.cache = {}
+
+
+@receiver(request_finished)
+def _finish_request_cache(**kwargs) -> None:
+    _storage.cache = None
+
+
+def clear_request_cache() -> None:
+    """
+    Drop everything cached for the current request.
+    """
+
+    cache: dict | None = getattr(_storage, "cache", None)
+    if cache is not None:
+        cache.clear()
+
+
+def cache_for_request(method: Callable) -> Callable:
+    """
+    Cache result of backend's method(user_obj, obj, *args) until the end of
+    the current request. Results are keyed by user's pk instead of the user
+    object, so different instances of the same user share them.
+
+    Calls made outside of request/response cycle (shell, management
+    commands, workers) are not cached.
+    """
+
+    @wraps(method)
+    def wrapper(self, user_obj, obj=None, *args) -> Any:
+        cache: dict | None = getattr(_storage, "cache", None)
+        if cache is None or user_obj.pk is None:
+            return method(self, user_obj, obj, *args)
+
+        key = (type(self), method.__name__, user_obj.pk, id(obj), args)
+        if key not in cache:
+            cache[key] = method(self, user_obj, obj, *args)
+        return cache[key]
+
+    return wrapper
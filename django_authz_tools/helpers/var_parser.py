@@ -1,6 +1,9 @@
 import inspect
+import warnings
+from collections.abc import Collection
 from dataclasses import dataclass
 from enum import StrEnum, auto
+from functools import lru_cache
 from types import FrameType, ModuleType
 from typing import Any, Type, TypeVar, Self
 
@@ -35,6 +38,7 @@ def obj_name(obj: Any, frame: FrameType | None = None) -> str:
 
     WARNING: result is not guarantined.
     Raises AmbiguousVariableNameException in a set of regular cases.
+    It walks the caller's frame, so it's slow: use it for debugging only.
     """
 
     frame: FrameType = frame or inspect.currentframe().f_back
@@ -65,17 +69,28 @@ class AccessType(StrEnum):
     DUNDER = auto()
 
     @classmethod
+    @lru_cache(maxsize=512)
     def from_obj_name(cls, name: str) -> Self:
-        if name[-2:] == "__" and name[:2] == "__":
+        if name.startswith("__") and name.endswith("__"):
             return AccessType.DUNDER
-        elif name[:2] == "__":
+        elif name.startswith("__"):
             return AccessType.PRIVATE
-        elif name[:1] == "_":
+        elif name.startswith("_"):
             return AccessType.PROTECTED
         return AccessType.PUBLIC
 
     @classmethod
     def from_obj(cls, obj: Any) -> Self:
+        """
+        Deprecated: uses slow and unreliable obj_name(obj) function.
+        Use AccessType.from_obj_name(name) instead.
+        """
+
+        warnings.warn(
+            "AccessType.from_obj() is deprecated, use AccessType.from_obj_name() instead.",
+            DeprecationWarning,
+            stacklevel=2,
+        )
         return cls.from_obj_name(name=obj_name(obj))
 
     @classmethod
@@ -94,11 +109,11 @@ def _is_const(name: str) -> bool:
 
 
 def _is_class(name: str) -> bool:
-    first_char, other_chars = name.strip("_")[1], name.strip("_")[0:]
+    stripped_name = name.strip("_")
     return (
-        first_char.isupper() and
-        "_" not in name and
-        any([char != char.upper() for char in name])
+        stripped_name[:1].isupper() and
+        "_" not in stripped_name and
+        any(char != char.upper() for char in stripped_name)
     )
 
 
@@ -122,16 +137,16 @@ class ObjInfo:
     Implemented as frozen class: you can't change it after initialization.
     """
 
-    name: str
-    value: TObj
-    type_: Type[TObj]
-    access_type: AccessType
-    is_const: bool
-    is_class: bool
-    is_callable: bool
+    property_names = ("name", "value", "type", "access_type", "is_const", "is_class", "is_callable")
+    __slots__ = tuple(f"_{name}" for name in property_names)
 
-    property_names = ["name", "value", "type", "access_type", "is_const", "is_class", "is_callable"]
-    __slots__ = property_names + [f"_{name}" for name in property_names]
+    name: str = _readonly_property("name")
+    value: TObj = _readonly_property("value")
+    type: Type[TObj] = _readonly_property("type")
+    access_type: AccessType = _readonly_property("access_type")
+    is_const: bool = _readonly_property("is_const")
+    is_class: bool = _readonly_property("is_class")
+    is_callable: bool = _readonly_property("is_callable")
 
     def __init__(
         self,
@@ -148,15 +163,19 @@ class ObjInfo:
             setattr(self, f"_{name}", value)
 
         self.validate()
-        self._set_readonly_properties()
 
     @classmethod
     def from_obj(cls, obj: TObj) -> Self:
         """
-        This implementation uses unreliable obj_name(obj) function.
-        We reccomend to use self.from_name_and_value(name, value) instead.
+        Deprecated: uses slow and unreliable obj_name(obj) function.
+        Use ObjInfo.from_name_and_value(name, value) instead.
         """
 
+        warnings.warn(
+            "ObjInfo.from_obj() is deprecated, use ObjInfo.from_name_and_value() instead.",
+            DeprecationWarning,
+            stacklevel=2,
+        )
         return cls.from_name_and_value(name=obj_name(obj), value=obj)
 
     @classmethod
@@ -179,16 +198,12 @@ class ObjInfo:
         self._types_consistent(value=self.value, type_=self.type)
 
     @staticmethod
-    def _types_consistent(value: TObj, type_=type[TObj]) -> None:
+    def _types_consistent(value: TObj, type_: Type[TObj]) -> None:
         if type(value) != type_:
             raise ValidationError(
                 f"Object with {value=} is of type {type(value)}, must be of {type_}!"
             )
 
-    def _set_readonly_properties(self):
-        for property_name in self.property_names:
-            setattr(self, property_name, _readonly_property(property_name))
-
     def __str__(self):
         return (
             f"VarInfo "
@@ -204,18 +219,38 @@ class ParsingOptions:
     Tell which objects to parse from module.
     """
 
-    access_types: set[AccessType] | None = None
+    access_types: Collection[AccessType] | None = None
     is_const: bool | None = None
     is_class: bool | None = None
     is_callable: bool | None = None
 
-    def is_valid_for(self, name: str, value: Any) -> bool:
-        obj_info = ObjInfo.from_name_and_value(name, value)
+    def is_valid_for_name(self, name: str) -> bool:
+        """
+        Check only options that can be told from the name,
+        without getting the value and building ObjInfo.
+        """
 
-        is_access_valid = not self.access_types or (obj_info.access_type in self.access_types)
-        is_other_valid = all([b in [True, None] for b in (self.is_class, self.is_class, self.is_callable)])
+        if self.access_types and AccessType.from_obj_name(name) not in self.access_types:
+            return False
+        if self.is_const is not None and _is_const(name) != self.is_const:
+            return False
+        if self.is_class is not None and _is_class(name) != self.is_class:
+            return False
+        return True
 
-        return is_access_valid and is_other_valid
+    def is_valid_for(self, name: str, value: Any) -> bool:
+        return self.is_valid_for_info(ObjInfo.from_name_and_value(name, value))
+
+    def is_valid_for_info(self, obj_info: ObjInfo) -> bool:
+        if self.access_types and obj_info.access_type not in self.access_types:
+            return False
+        if self.is_const is not None and obj_info.is_const != self.is_const:
+            return False
+        if self.is_class is not None and obj_info.is_class != self.is_class:
+            return False
+        if self.is_callable is not None and obj_info.is_callable != self.is_callable:
+            return False
+        return True
 
     def __str__(self):
         return (
@@ -226,11 +261,28 @@ class ParsingOptions:
 
 
 def parse_module_attrs(module: ModuleType, options: ParsingOptions | None = None) -> list[ObjInfo]:
-    def value(attr_name: str) -> Any:
-        return getattr(module, attr_name)
-
-    return [
-        ObjInfo.from_name_and_value(name, value(name))
-        for name in dir(module)
-        if options and options.is_valid_for(name, value(name))
-    ]
+    """
+    Get info about module's attributes, filtered by options if given.
+    """
+
+    objs_info = []
+    for name in dir(module):
+        if not (options is None or options.is_valid_for_name(name)):
+            continue
+        obj_info = ObjInfo.from_name_and_value(name, getattr(module, name))
+        if options is None or options.is_valid_for_info(obj_info):
+            objs_info.append(obj_info)
+    return objs_info
+
+
+CONSTS_PARSING_OPTIONS = ParsingOptions(access_types=frozenset({AccessType.PUBLIC}), is_const=True)
+
+
+@lru_cache(maxsize=None)
+def parse_consts_from_module(module: ModuleType) -> tuple[ObjInfo, ...]:
+    """
+    Get info about public constants of the module.
+    Result is cached per module, as module contents don't change at runtime.
+    """
+
+    return tuple(parse_module_attrs(module=module, options=CONSTS_PARSING_OPTIONS))
@@ -1,4 +1,5 @@
-from typing import TypeVar
+from functools import cache, cached_property
+from typing import TYPE_CHECKING
 
 from django.contrib.auth.models import (
     AbstractBaseUser,
@@ -15,8 +16,10 @@ from django.db.models.manager import EmptyManager
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
-from django_authz_tools.models.managers import BaseGroupManager
-from django_authz_tools.helpers.misc import has_not_empty
+from django_authz_tools.models.managers import GroupManager
+
+
+_USERNAME_VALIDATOR = UnicodeUsernameValidator()  # shared by all user models
 
 
 class BasePermission(models.Model):
@@ -37,13 +40,16 @@ class BasePermission(models.Model):
         abstract = True
 
     def __str__(self):
-        return "Permission<{}>".format(self.pk)
+        return f"Permission<{self.pk}>"
 
     def natural_key(self) -> tuple:
         raise NotImplementedError("")
 
 
-Permission = TypeVar("Permission", bound=BasePermission | DefaultPermission)
+if TYPE_CHECKING:
+    Permission = BasePermission | DefaultPermission
+
+PERMISSION_TYPES = (BasePermission, DefaultPermission)  # for runtime type checks
 
 
 class BaseGroup(models.Model):
@@ -59,19 +65,28 @@ class BaseGroup(models.Model):
         help_text=_("Optional info reference of scope to ease usage"),
     )
 
-    objects = BaseGroupManager()
+    objects = GroupManager()
+
+    _REPR_FMT = "Group<%s>"
 
     class Meta:
         abstract = True
 
     def __str__(self):
-        return f"Group<{self.pk=}>"
+        # Shown in admin widgets and autocomplete, so name is preferred.
+        return getattr(self, "name", None) or self._REPR_FMT % self.pk
+
+    def __repr__(self):
+        return self._REPR_FMT % self.pk
 
     def natural_key(self):
         raise NotImplementedError("")
 
 
-Group = TypeVar("Group", bound=BaseGroup | DefaultGroup)
+if TYPE_CHECKING:
+    Group = BaseGroup | DefaultGroup
+
+GROUP_TYPES = (BaseGroup, DefaultGroup)  # for runtime type checks
 
 
 class CustomAbstractBaseUser(AbstractBaseUser):
@@ -82,7 +97,7 @@ class CustomAbstractBaseUser(AbstractBaseUser):
     Username and password are required. Other fields are optional.
     """
 
-    username_validator = UnicodeUsernameValidator()
+    username_validator = _USERNAME_VALIDATOR
 
     username = models.CharField(
         _("username"),
@@ -146,19 +161,14 @@ class CustomAbstractBaseUser(AbstractBaseUser):
         self.email = self.__class__.objects.normalize_email(self.email)
 
     def get_full_name(self) -> str:
-        if has_not_empty(self, "first_name") or has_not_empty(self, "last_name"):
-            full_name = f"{self.first_name} {self.last_name}"
-        elif has_not_empty(self, self.USERNAME_FIELD):
-            full_name = self.username
-        else:
-            full_name = "Incognito"
-        return full_name.strip()
+        full_name = " ".join(name for name in (self.first_name, self.last_name) if name)
+        return full_name or self.username or "Incognito"
 
     def get_short_name(self) -> str:
         """Return the short name for the user."""
         short_name = (
             self.first_name or
-            self.name or
+            getattr(self, "name", "") or
             self.username or
             self.email
         )
@@ -176,13 +186,39 @@ class CustomAbstractBaseUser(AbstractBaseUser):
         )
 
 
-def get_singleton_anonymous_user_model() -> type[DefaultAnonymousUser]:
-    return AnonymousUser
+class SharedEmptyManager(EmptyManager):
+    """
+    EmptyManager returning the same prebuilt empty queryset on every call,
+    instead of constructing a new one. It never hits the database, and
+    chained methods like filter() clone it, so sharing it is safe.
+    """
 
+    @cached_property
+    def _empty_queryset(self) -> models.QuerySet:
+        return super().get_queryset()
 
-AnonymousUser = get_singleton_anonymous_user_model()
+    def get_queryset(self) -> models.QuerySet:
+        return self._empty_queryset
 
 
 class AnonymousUser(DefaultAnonymousUser):
-    _groups = EmptyManager(Group)
-    _user_permissions = EmptyManager(Permission)
+    @classmethod
+    @cache
+    def _get_empty_managers(cls) -> tuple[SharedEmptyManager, SharedEmptyManager]:
+        """
+        Build managers for the project's group and permission models once,
+        on first access, as models can't be resolved at import time.
+        """
+
+        from django_authz_tools.helpers.model_utils import get_group_model, get_permission_model
+
+        return SharedEmptyManager(get_group_model()), SharedEmptyManager(get_permission_model())
+
+    @cached_property
+    def _groups(self) -> SharedEmptyManager:
+        return self._get_empty_managers()[0]
+
+    @cached_property
+    def _user_permissions(self) -> SharedEmptyManager:
+        return self._get_empty_managers()[1]
+
@@ -1,10 +1,10 @@
 from django.utils.translation import gettext_lazy as _
 
 from django_authz_tools.models.base import CustomAbstractBaseUser as AbstractBaseUser
-from django_authz_tools.models.mixins import NoGroupsMixin, NoUserPermissionsMixin
+from django_authz_tools.models.mixins import NoAccessControlMixin
 
 
-class AbstractUser(AbstractBaseUser, NoGroupsMixin, NoUserPermissionsMixin):
+class AbstractUser(AbstractBaseUser, NoAccessControlMixin):
     class Meta:
         abstract = True
         verbose_name = _("user")
@@ -1,4 +1,5 @@
 from django.contrib.auth.base_user import AbstractBaseUser
+from django.contrib.auth.models import PermissionsMixin
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 
@@ -28,21 +29,25 @@ class Role(BaseGroup):
         help_text=_("Optional info description of group to ease usage"),
     )
 
+    _STR_FMT = "Role<%s>"
+
     class Meta:
         abstract = True
         verbose_name = _("role")
         verbose_name_plural = _("role")
 
     def __str__(self):
-        return "Role<{}>".format(self.name)
+        return self._STR_FMT % self.name
 
     def natural_key(self) -> tuple[models.CharField]:
         return (self.name,)
 
 
 class RolesMixin(PermissionsMixin):
-    pass
+    class Meta:
+        abstract = True
 
 
 class AbstractUser(AbstractBaseUser, RolesMixin):
-    pass
+    class Meta:
+        abstract = True
@@ -1,13 +1,18 @@
-from django.contrib.auth.validators import UnicodeUsernameValidator
+from django.contrib.auth.base_user import AbstractBaseUser
+from django.contrib.auth.models import (
+    Group as DefaultGroup,
+    Permission as DefaultPermission,
+    PermissionsMixin as DefaultPermissionsMixin,
+)
 from django.contrib.contenttypes.models import ContentType
 from django.core.mail import send_mail
 from django.db import models
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
-from django_authz_tools.models.ac_1d import Role as SimpleGroup
-from django_authz_tools.models.base import BasePermission, BaseGroup
-from django_authz_tools.models.managers import PermissionManager
+from django_authz_tools.models.base import _USERNAME_VALIDATOR, BasePermission
+from django_authz_tools.models.impls.ac_1d import Role as SimpleGroup
+from django_authz_tools.models.managers import PermissionManager, PermissionQuerySet
 
 
 class Permission(BasePermission):
@@ -24,7 +29,6 @@ class Permission(BasePermission):
         unique=True,
         null=False,
         blank=False,
-        db_index=True,
         help_text=_("Codename, e.g. can_vote."),
     )
 
@@ -45,6 +49,22 @@ class RouteBasedPermission(BasePermission):
     route = ""
     precise = True
 
+    class Meta:
+        abstract = True
+
+
+class ResourceBasedPermissionQuerySet(PermissionQuerySet):
+    def get_by_natural_key(self, codename: str, app_label: str, model: str):
+        return self.select_related("resource_type").get(
+            codename=codename,
+            resource_type__app_label=app_label,
+            resource_type__model=model,
+        )
+
+
+class ResourceBasedPermissionManager(PermissionManager.from_queryset(ResourceBasedPermissionQuerySet)):
+    pass
+
 
 class ResourceBasedPermission(BasePermission):
     """
@@ -58,31 +78,40 @@ class ResourceBasedPermission(BasePermission):
         ContentType,
         models.CASCADE,
         verbose_name=_("resourse type"),
+        db_index=False,  # covered by (resource_type, codename) unique constraint
+    )
+    codename = models.CharField(
+        _("codename"),
+        max_length=127,
+        null=False,
+        blank=False,
+        help_text=_("Codename, unique within resource type, e.g. can_vote."),
     )
-
-    class ResourceBasedPermissionManager(PermissionManager):
-        def get_by_natural_key(self, codename: str, app_label: str, model: str):
-            return self.get(
-                codename=codename,
-                content_type=ContentType.objects.db_manager(self.db).get_by_natural_key(
-                    app_label, model
-                ),
-            )
 
     objects = ResourceBasedPermissionManager()
 
     class Meta:
         abstract = True
-        ordering = ["name"]
+        ordering = ["codename"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["resource_type", "codename"],
+                name="%(app_label)s_%(class)s_resource_type_codename_uniq",
+            ),
+        ]
 
     def natural_key(self) -> tuple:
-        return (self.codename,) + self.resource_type.natural_key()
+        # ContentType manager caches content types by id, so dumpdata
+        # doesn't query resource type of every permission.
+        resource_type = ContentType.objects.get_for_id(self.resource_type_id)
+        return (self.codename,) + resource_type.natural_key()
 
     natural_key.dependencies = ["contenttypes.contenttype"]
 
 
 class PermissionGroup(SimpleGroup):
-    pass
+    class Meta:
+        abstract = True
 
 
 class PermissionsMixin(DefaultPermissionsMixin):
@@ -96,7 +125,7 @@ class PermissionsMixin(DefaultPermissionsMixin):
     """
 
     groups = models.ManyToManyField(
-        Group,
+        DefaultGroup,
         verbose_name=_("groups"),
         blank=True,
         help_text=_(
@@ -108,7 +137,7 @@ class PermissionsMixin(DefaultPermissionsMixin):
         related_query_name="user",
     )
     user_permissions = models.ManyToManyField(
-        Permission,
+        DefaultPermission,
         verbose_name=_("user permissions"),
         blank=True,
         help_text=_("Specific permissions for this user."),
@@ -128,7 +157,7 @@ class AbstractUser(AbstractBaseUser, PermissionsMixin):
     Username and password are required. Other fields are optional.
     """
 
-    username_validator = UnicodeUsernameValidator()
+    username_validator = _USERNAME_VALIDATOR
 
     username = models.CharField(
         _("username"),
@@ -159,10 +188,20 @@ class AbstractUser(AbstractBaseUser, PermissionsMixin):
         ),
     )
     date_joined = models.DateTimeField(_("date joined"), default=timezone.now)
+    effective_perms = models.JSONField(
+        _("effective permissions"),
+        null=True,
+        default=None,
+        editable=False,
+        help_text=_(
+            "Names of all permissions of the user, including group ones. "
+            "Kept in sync on their change, null if not computed yet."
+        ),
+    )
 
     EMAIL_FIELD = "email"
     USERNAME_FIELD = "username"
-    REQUIRED_FIELDS = ["username"]
+    REQUIRED_FIELDS = ["email"]
 
     class Meta:
         abstract = True
@@ -1,40 +1,177 @@
-from typing import TypeVar
+from collections.abc import Iterable
+from typing import TYPE_CHECKING
 
+from django.conf import settings
 from django.contrib.auth.models import (
     GroupManager as BaseGroupManager,
     UserManager,
 )
 from django.db import models
+from django.db.models import Prefetch
 from django.db.models.query import QuerySet
 
+if TYPE_CHECKING:
+    from django.contrib.auth.models import AbstractUser
+    from django_authz_tools.models.base import Group, Permission
 
-class PermissionManager(models.Manager):
+
+class PermissionQuerySet(models.QuerySet):
     """
-    \\
+    QuerySet for permission models. Its methods are available on managers too,
+    so they may be chained with filters: objects.filter(...).get_by_natural_key(...).
     """
 
-    use_in_migrations = True
-
     def get_by_natural_key(self, *args, **kwargs) -> "Permission":
         raise NotImplementedError("")
 
+    def sync_by_codenames(self, codenames: Iterable[str], **fields) -> "QuerySet[Permission]":
+        """
+        Create permissions with given codenames if there are no such already,
+        filling other columns of created ones from fields. Return permissions
+        with given codenames and fields with 3 queries regardless of their amount.
+
+        Conflicting rows are skipped, not updated: a codename which is already
+        taken with other values of fields (e.g. the same content type but another
+        name) is neither created nor returned, so pass only identifying fields.
+        """
+
+        codenames = set(codenames)
+        permissions = self.filter(**fields)
+        existing = set(permissions.filter(codename__in=codenames).values_list("codename", flat=True))
+        missing = [self.model(codename=codename, **fields) for codename in codenames - existing]
+        if missing:
+            self.bulk_create(missing, ignore_conflicts=True)
+        return permissions.filter(codename__in=codenames)
+
+
+class PermissionManager(models.Manager.from_queryset(PermissionQuerySet)):
+    """
+    Manager for permission models. Subclass PermissionQuerySet and use
+    PermissionManager.from_queryset() to add methods for concrete models.
+    """
+
+    use_in_migrations = True
+
+
+class GroupManager(BaseGroupManager):
+    """
+    The manager for group models.
+    """
+
+    def sync_by_natural_keys(self, names: Iterable[str]) -> "QuerySet[Group]":
+        """
+        Create groups with given names if there are no such already, e.g.
+        when syncing groups from identity provider's claims. Return groups
+        with given names with 3 queries regardless of their amount.
+        """
+
+        return _sync_groups_by_names(self, names)
 
-GroupManager = TypeVar("GroupManager", bound=BaseGroupManager)
 
+def _sync_groups_by_names(groups: models.Manager, names: Iterable[str]) -> "QuerySet[Group]":
+    # Shared with get_or_create_groups(), as group models may have other managers.
+    names = set(names)
+    existing = set(groups.filter(name__in=names).values_list("name", flat=True))
+    missing = [groups.model(name=name) for name in names - existing]
+    if missing:
+        groups.bulk_create(missing, ignore_conflicts=True)
+    return groups.filter(name__in=names)
 
-class PrefetchGroupManager(BaseGroupManager):
+
+class PrefetchGroupManager(GroupManager):
     """
     The manager for the auth's Group model.
+
+    Default queryset doesn't prefetch anything, so fetching single group
+    takes one query. Use with_permissions() when groups' permissions are
+    going to be accessed, e.g. in list views.
     """
 
-    def get_queryset(self) -> "QuerySet[Group]":
-        return super().get_queryset().prefetch_related("permissions")
+    def with_permissions(self) -> "QuerySet[Group]":
+        return self.get_queryset().prefetch_related("permissions")
 
 
 class PrefetchUserManager(UserManager):
     """
+    The manager for the User model.
 
+    Default queryset doesn't prefetch anything, so User.objects.get(pk=...)
+    takes one query. Use with_groups() or with_all_perms() when related
+    objects are going to be accessed, e.g. in list views.
     """
 
-    def get_queryset(self) -> "QuerySet[AbstractUser]":
-        return super().get_queryset().prefetch_related("groups")
+    def lean(self) -> "QuerySet[AbstractUser]":
+        """
+        Load only columns usually shown in user lists. Accessing other fields
+        costs one query per user, so use it only when they aren't rendered.
+        """
+
+        field_names = (self.model.USERNAME_FIELD, self.model.get_email_field_name(), "is_active", "is_staff")
+        concrete_field_names = {field.name for field in self.model._meta.concrete_fields}
+        return self.get_queryset().only(*(name for name in field_names if name in concrete_field_names))
+
+    def with_groups(self) -> "QuerySet[AbstractUser]":
+        return self.get_queryset().prefetch_related("groups")
+
+    def with_all_perms(self) -> "QuerySet[AbstractUser]":
+        return self.get_queryset().prefetch_related("groups__permissions", "user_permissions")
+
+    def with_perms_graph(self) -> "QuerySet[AbstractUser]":
+        """
+        Prefetch groups and permissions of users with 3 extra queries in total,
+        regardless of amount of users and groups. Permissions are loaded with
+        only the columns used by auth backends.
+
+        Without settings.AUTHZ_PERM_FILTER this is with_all_perms_graph(), and
+        permission checks are answered from memory. The filter is app label(s)
+        to load permissions of, or callable filtering permissions queryset.
+        Filtered permissions are for display only: they are put into
+        user.filtered_user_permissions and group.filtered_permissions lists,
+        auth backends ignore them and permission checks query the database as usual.
+        """
+
+        perm_filter = getattr(settings, "AUTHZ_PERM_FILTER", None)
+        if perm_filter is None:
+            return self.with_all_perms_graph()
+
+        permissions = self._get_graph_permissions()
+        if callable(perm_filter):
+            permissions = perm_filter(permissions)
+        else:
+            if isinstance(perm_filter, str):
+                perm_filter = (perm_filter,)
+            permissions = permissions.filter(content_type__app_label__in=perm_filter)
+        return self._prefetch_perms_graph(
+            permissions,
+            user_permissions_attr="filtered_user_permissions",
+            group_permissions_attr="filtered_permissions",
+        )
+
+    def with_all_perms_graph(self) -> "QuerySet[AbstractUser]":
+        """
+        Same as with_perms_graph(), but loads all permissions
+        regardless of settings.AUTHZ_PERM_FILTER.
+        """
+
+        return self._prefetch_perms_graph(self._get_graph_permissions())
+
+    def _get_graph_permissions(self) -> "QuerySet[Permission]":
+        permission_model = self.model._meta.get_field("user_permissions").related_model
+        return permission_model.objects.only("codename", "content_type")
+
+    def _prefetch_perms_graph(
+        self,
+        permissions: "QuerySet[Permission]",
+        user_permissions_attr: str | None = None,
+        group_permissions_attr: str | None = None,
+    ) -> "QuerySet[AbstractUser]":
+        group_model = self.model._meta.get_field("groups").related_model
+        return self.get_queryset().prefetch_related(
+            Prefetch(
+                "groups",
+                queryset=group_model.objects.prefetch_related(
+                    Prefetch("permissions", queryset=permissions, to_attr=group_permissions_attr),
+                ),
+            ),
+            Prefetch("user_permissions", queryset=permissions, to_attr=user_permissions_attr),
+        )
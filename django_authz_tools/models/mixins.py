@@ -1,4 +1,9 @@
+from django.conf import settings
 from django.contrib.auth.models import PermissionsMixin
+from django.db.models.signals import class_prepared
+from django.dispatch import receiver
+
+from django_authz_tools.helpers.model_utils import get_or_create_groups
 
 
 class BasePermissionsMixin(PermissionsMixin):
@@ -16,7 +21,24 @@ class BasePermissionsMixin(PermissionsMixin):
         abstract = True
 
 
-class NoGroupsMixin(PermissionsMixin):
+def _has_perm_if_superuser(self, *args, **kwargs) -> bool:
+    return self.is_active and self.is_superuser
+
+
+@receiver(class_prepared)
+def _specialize_permission_checks(sender, **kwargs) -> None:
+    # Decided once per concrete model, when its fields are final: with no groups
+    # and no user permissions there is nothing to ask auth backends about.
+    if not issubclass(sender, BasePermissionsMixin):
+        return
+    if {field.name for field in sender._meta.many_to_many} & {"groups", "user_permissions"}:
+        return
+    for method_name in ("has_perm", "has_perms", "has_module_perms"):
+        if getattr(sender, method_name) is getattr(PermissionsMixin, method_name):
+            setattr(sender, method_name, _has_perm_if_superuser)
+
+
+class NoGroupsMixin(BasePermissionsMixin):
     """
     Disables default flow of group permissions.
     It works like every user is in every group.
@@ -30,7 +52,7 @@ class NoGroupsMixin(PermissionsMixin):
         abstract = True
 
 
-class NoUserPermissionsMixin(PermissionsMixin):
+class NoUserPermissionsMixin(BasePermissionsMixin):
     """
     Deletes user_permissions field from user model.
     """
@@ -43,9 +65,15 @@ class NoUserPermissionsMixin(PermissionsMixin):
 
 class NoAccessControlMixin(NoGroupsMixin, NoUserPermissionsMixin):
     """
-    /
+    Disables both group and user permissions: only active superusers
+    pass permission checks, which are answered without auth backends.
     """
 
+    # Each base still inherits the field the other one deletes,
+    # so both have to be deleted here again.
+    groups = None
+    user_permissions = None
+
     class Meta:
         abstract = True
 
@@ -74,41 +102,82 @@ class NoSuperuser(PermissionsMixin):
         abstract = True
 
 
-class GroupBasedStaffMixin:
+def _apply_group_memberships(user, memberships: dict[str, bool]) -> None:
+    groups = {group.name: group for group in get_or_create_groups(memberships)}
+    user.groups.add(*(groups[name] for name, is_member in memberships.items() if is_member))
+    user.groups.remove(*(groups[name] for name, is_member in memberships.items() if not is_member))
+
+
+def _group_membership_property(group_name_attr: str, setting_name: str, cache_name: str) -> property:
     """
-    Modifies user model so is_staff is implemented
-    with groups and not with binary field.
+    Build a boolean property telling whether the user is in the group
+    named by group_name_attr of the class, or by setting_name by default.
+
+    Result is cached on the instance. When groups of the user have been
+    prefetched, the check is answered from memory without any query.
+    Values set on unsaved users are applied when they're saved.
     """
 
-    is_staff = None
+    def get_group_name(user) -> str:
+        return getattr(user, group_name_attr) or getattr(settings, setting_name)
 
-    @property
-    def is_staff(self) -> bool:
-        pass
+    def getter(self) -> bool:
+        if cache_name not in self.__dict__:
+            groups = getattr(self, "groups", None)
+            if groups is None or self.pk is None:
+                is_member = False
+            elif "groups" in getattr(self, "_prefetched_objects_cache", {}):
+                group_name = get_group_name(self)
+                is_member = any(group.name == group_name for group in groups.all())
+            else:
+                is_member = groups.filter(name=get_group_name(self)).exists()
+            self.__dict__[cache_name] = is_member
+        return self.__dict__[cache_name]
 
-    @is_staff.setter
-    def is_staff(self, value: bool) -> None:
-        pass
+    def setter(self, value: bool) -> None:
+        if self.pk is None:
+            # Groups can't be set before the user is saved, e.g. in UserManager.create_superuser().
+            self.__dict__.setdefault("_pending_group_memberships", {})[get_group_name(self)] = bool(value)
+        else:
+            _apply_group_memberships(self, {get_group_name(self): bool(value)})
+        self.__dict__[cache_name] = bool(value)
 
-    class Meta:
-        abstract = True
+    return property(getter, setter)
 
 
-class GroupBasedSuperuserMixin:
+class _GroupMembershipMixin:
+    def save(self, *args, **kwargs) -> None:
+        super().save(*args, **kwargs)
+        pending_memberships = self.__dict__.pop("_pending_group_memberships", None)
+        if pending_memberships:
+            _apply_group_memberships(self, pending_memberships)
+
+
+class GroupBasedStaffMixin(_GroupMembershipMixin):
     """
-    Modifies user model so is_superuser is implemented
+    Modifies user model so is_staff is implemented
     with groups and not with binary field.
+
+    Membership is checked against STAFF_GROUP_NAME group,
+    settings.DEFAULT_STAFF_GROUP_NAME by default.
     """
 
-    is_superuser = None
+    STAFF_GROUP_NAME: str | None = None
 
-    @property
-    def is_superuser(self) -> bool:
-        pass
+    is_staff = _group_membership_property("STAFF_GROUP_NAME", "DEFAULT_STAFF_GROUP_NAME", "_is_staff_cache")
 
-    @is_superuser.setter
-    def is_superuser(self, value: bool) -> None:
-        pass
 
-    class Meta:
-        abstract = True
+class GroupBasedSuperuserMixin(_GroupMembershipMixin):
+    """
+    Modifies user model so is_superuser is implemented
+    with groups and not with binary field.
+
+    Membership is checked against SUPERUSER_GROUP_NAME group,
+    settings.DEFAULT_SUPERUSER_GROUP_NAME by default.
+    """
+
+    SUPERUSER_GROUP_NAME: str | None = None
+
+    is_superuser = _group_membership_property(
+        "SUPERUSER_GROUP_NAME", "DEFAULT_SUPERUSER_GROUP_NAME", "_is_superuser_cache"
+    )
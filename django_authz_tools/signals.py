@@ -0,0 +1,157 @@
+from functools import partial
+
+from django.contrib.auth import get_user_model
+from django.db.models import Q
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+
+from django_authz_tools.auth_backends import clear_perm_cache, refresh_effective_perms, refresh_users_effective_perms
+from django_authz_tools.helpers.model_utils import get_group_model, get_permission_model
+from django_authz_tools.helpers.request_cache import clear_request_cache
+
+
+def _on_user_perms_changed(sender, instance, action: str, reverse: bool, **kwargs) -> None:
+    if not action.startswith("post_"):
+        return
+    if reverse:
+        # Instance is a group or a permission: affected user objects aren't reachable.
+        clear_request_cache()
+    else:
+        clear_perm_cache(instance)
+
+
+def _on_group_perms_changed(sender, action: str, **kwargs) -> None:
+    if action.startswith("post_"):
+        clear_request_cache()
+
+
+def _on_user_saved(sender, instance, **kwargs) -> None:
+    clear_perm_cache(instance)
+
+
+def _on_user_perms_changed_refresh(
+    sender, instance, action: str, reverse: bool, pk_set: set | None, relation_name: str, **kwargs
+) -> None:
+    user_model = get_user_model()
+    if not reverse:
+        if action.startswith("post_"):
+            refresh_effective_perms(instance)
+    elif action == "pre_clear":
+        # Instance is a group or a permission: remember its users before they are gone.
+        users = user_model._default_manager.filter(**{relation_name: instance})
+        instance._affected_user_pks = list(users.values_list("pk", flat=True))
+    elif action == "post_clear":
+        refresh_users_effective_perms(instance.__dict__.pop("_affected_user_pks", ()))
+    elif action.startswith("post_"):
+        refresh_users_effective_perms(pk_set or ())
+
+
+def _on_group_perms_changed_refresh(
+    sender, instance, action: str, reverse: bool, pk_set: set | None, **kwargs
+) -> None:
+    users = get_user_model()._default_manager
+    if not reverse:
+        # Instance is a group.
+        if action.startswith("post_"):
+            refresh_users_effective_perms(users.filter(groups=instance).values_list("pk", flat=True))
+    elif action == "pre_clear":
+        # Instance is a permission: remember affected users before its groups are gone.
+        affected_users = users.filter(groups__permissions=instance).distinct()
+        instance._affected_user_pks = list(affected_users.values_list("pk", flat=True))
+    elif action == "post_clear":
+        refresh_users_effective_perms(instance.__dict__.pop("_affected_user_pks", ()))
+    elif action.startswith("post_"):
+        refresh_users_effective_perms(users.filter(groups__in=pk_set).values_list("pk", flat=True))
+
+
+def _get_affected_user_pks(instance, user_filters: tuple[str, ...]) -> list:
+    users = get_user_model()._default_manager
+    user_q = Q(pk__in=[])
+    for user_filter in user_filters:
+        user_q |= Q(**{user_filter: instance})
+    return list(users.filter(user_q).distinct().values_list("pk", flat=True))
+
+
+def _on_perms_source_pre_delete(sender, instance, user_filters: tuple[str, ...], **kwargs) -> None:
+    # Through rows are deleted by cascade without m2m_changed,
+    # so users granted anything by the instance are remembered here.
+    instance._affected_user_pks = _get_affected_user_pks(instance, user_filters)
+
+
+def _on_perms_source_post_delete(sender, instance, **kwargs) -> None:
+    refresh_users_effective_perms(instance.__dict__.pop("_affected_user_pks", ()))
+
+
+def _on_permission_saved(sender, instance, created: bool, user_filters: tuple[str, ...], **kwargs) -> None:
+    # Codename or content type may have changed, renaming the permission for its users.
+    if not created:
+        refresh_users_effective_perms(_get_affected_user_pks(instance, user_filters))
+
+
+def _connect_effective_perms_source_signals(user_model) -> None:
+    user_relations = {field.name for field in user_model._meta.many_to_many}
+    group_model = get_group_model()
+    permission_user_filters = []
+    if "user_permissions" in user_relations:
+        permission_user_filters.append("user_permissions")
+
+    if "groups" in user_relations:
+        permission_user_filters.append("groups__permissions")
+        _connect_delete_signals(group_model, user_filters=("groups",))
+    if permission_user_filters:
+        permission_model = get_permission_model()
+        _connect_delete_signals(permission_model, user_filters=tuple(permission_user_filters))
+        post_save.connect(
+            partial(_on_permission_saved, user_filters=tuple(permission_user_filters)),
+            sender=permission_model,
+            weak=False,
+            dispatch_uid="django_authz_tools_refresh_effective_perms_on_permission_save",
+        )
+
+
+def _connect_delete_signals(sender, user_filters: tuple[str, ...]) -> None:
+    uid = f"django_authz_tools_refresh_effective_perms_on_{sender._meta.label_lower}_delete"
+    pre_delete.connect(
+        partial(_on_perms_source_pre_delete, user_filters=user_filters),
+        sender=sender,
+        weak=False,
+        dispatch_uid=uid,
+    )
+    post_delete.connect(_on_perms_source_post_delete, sender=sender, dispatch_uid=uid)
+
+
+def _connect_effective_perms_signals(user_model) -> None:
+    for relation_name in ("groups", "user_permissions"):
+        relation = getattr(user_model, relation_name, None)
+        if relation is not None:
+            m2m_changed.connect(
+                partial(_on_user_perms_changed_refresh, relation_name=relation_name),
+                sender=relation.through,
+                weak=False,
+                dispatch_uid=f"django_authz_tools_refresh_effective_perms_{relation_name}",
+            )
+
+    group_permissions = getattr(get_group_model(), "permissions", None)
+    if getattr(user_model, "groups", None) is not None and group_permissions is not None:
+        m2m_changed.connect(_on_group_perms_changed_refresh, sender=group_permissions.through)
+
+    _connect_effective_perms_source_signals(user_model)
+
+
+def connect_signals() -> None:
+    """
+    Keep cached and denormalized permissions in sync whenever they may have changed.
+    """
+
+    user_model = get_user_model()
+    post_save.connect(_on_user_saved, sender=user_model)
+    for relation_name in ("groups", "user_permissions"):
+        relation = getattr(user_model, relation_name, None)
+        if relation is not None:
+            m2m_changed.connect(_on_user_perms_changed, sender=relation.through)
+
+    group_permissions = getattr(get_group_model(), "permissions", None)
+    if group_permissions is not None:
+        m2m_changed.connect(_on_group_perms_changed, sender=group_permissions.through)
+
+    if any(field.name == "effective_perms" for field in user_model._meta.concrete_fields):
+        _connect_effective_perms_signals(user_model)
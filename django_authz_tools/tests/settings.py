@@ -0,0 +1,27 @@
+"""
+Settings for running the test suite:
+
+    python -m django test django_authz_tools.tests --settings=django_authz_tools.tests.settings
+"""
+
+SECRET_KEY = "django-authz-tools-tests"
+
+INSTALLED_APPS = [
+    "django.contrib.auth",
+    "django.contrib.contenttypes",
+    "django_authz_tools",
+    "django_authz_tools.tests.testapp",
+]
+
+DATABASES = {
+    "default": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": ":memory:",
+    },
+}
+
+AUTH_USER_MODEL = "testapp.User"
+AUTHENTICATION_BACKENDS = ["django_authz_tools.auth_backends.ModelBackend"]
+
+DEFAULT_AUTO_FIELD = "django.db.models.AutoField"
+USE_TZ = True
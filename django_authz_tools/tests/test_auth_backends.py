@@ -0,0 +1,181 @@
+from django.contrib.auth.models import Group, Permission
+from django.contrib.contenttypes.models import ContentType
+from django.core.signals import request_finished, request_started
+from django.test import TestCase
+
+from django_authz_tools.auth_backends import (
+    AllPermissionsSet,
+    ModelBackend,
+    _get_perms_to_users_lookups,
+    clear_perm_cache,
+    prefetch_user_perms,
+)
+from django_authz_tools.tests.testapp.models import Team, TeamUser, User
+
+
+class ModelBackendTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.add_group = Permission.objects.get(content_type__app_label="auth", codename="add_group")
+        cls.change_group = Permission.objects.get(content_type__app_label="auth", codename="change_group")
+        cls.group = Group.objects.create(name="editors")
+        cls.group.permissions.add(cls.change_group)
+
+    def setUp(self):
+        self.backend = ModelBackend()
+        user = User.objects.create_user("user")
+        user.user_permissions.add(self.add_group)
+        user.groups.add(self.group)
+        # Without denormalized permissions checks are answered with queries.
+        User.objects.filter(pk=user.pk).update(effective_perms=None)
+        self.user = User.objects.get(pk=user.pk)
+
+    def test_get_user(self):
+        self.assertEqual(self.backend.get_user(self.user.pk), self.user)
+        self.assertIsNone(self.backend.get_user(self.user.pk + 1))
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        self.assertIsNone(self.backend.get_user(self.user.pk))
+
+    def test_get_permissions(self):
+        self.assertEqual(self.backend.get_user_permissions(self.user), {"auth.add_group"})
+        self.assertEqual(self.backend.get_group_permissions(self.user), {"auth.change_group"})
+        self.assertEqual(self.backend.get_all_permissions(self.user), {"auth.add_group", "auth.change_group"})
+
+    def test_has_perm(self):
+        self.assertTrue(self.backend.has_perm(self.user, "auth.add_group"))
+        self.assertTrue(self.backend.has_perm(self.user, "auth.change_group"))
+        self.assertFalse(self.backend.has_perm(self.user, "auth.delete_group"))
+
+    def test_inactive_user_has_no_permissions(self):
+        self.user.is_active = False
+        self.assertEqual(self.backend.get_all_permissions(self.user), set())
+        self.assertFalse(self.backend.has_perm(self.user, "auth.add_group"))
+
+    def test_object_permissions_are_not_supported(self):
+        self.assertEqual(self.backend.get_all_permissions(self.user, obj=self.group), set())
+        self.assertFalse(self.backend.has_perm(self.user, "auth.add_group", obj=self.group))
+
+    def test_permissions_are_cached_on_user(self):
+        with self.assertNumQueries(2):
+            self.backend.get_all_permissions(self.user)
+        with self.assertNumQueries(0):
+            self.assertTrue(self.backend.has_perm(self.user, "auth.add_group"))
+            self.assertFalse(self.backend.has_perm(self.user, "auth.delete_group"))
+
+    def test_clear_perm_cache(self):
+        self.backend.get_all_permissions(self.user)
+        clear_perm_cache(self.user)
+        with self.assertNumQueries(2):
+            self.backend.get_all_permissions(self.user)
+
+    def test_superuser_has_all_permissions_without_queries(self):
+        superuser = User.objects.create_superuser("admin", "admin@example.com", "password")
+        with self.assertNumQueries(0):
+            self.assertTrue(self.backend.has_perm(superuser, "auth.delete_group"))
+            perms = self.backend.get_all_permissions(superuser)
+            self.assertIsInstance(perms, AllPermissionsSet)
+            self.assertIn("auth.delete_group", perms)
+        self.assertEqual(len(perms), Permission.objects.count())
+
+    def test_inactive_superuser_has_no_permissions(self):
+        superuser = User.objects.create_superuser("admin", "admin@example.com", "password", is_active=False)
+        self.assertFalse(self.backend.has_perm(superuser, "auth.delete_group"))
+
+    def test_prefetched_permissions_are_used(self):
+        ContentType.objects.get_for_id(self.add_group.content_type_id)  # warm content types cache
+        with self.assertNumQueries(3):
+            prefetch_user_perms(self.user)
+            prefetch_user_perms(self.user)
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                self.backend.get_all_permissions(self.user), {"auth.add_group", "auth.change_group"}
+            )
+
+    def test_request_cache_is_shared_by_user_instances(self):
+        request_started.send(sender=None)
+        self.addCleanup(request_finished.send, sender=None)
+        self.backend.get_all_permissions(self.user)
+        other_instance = User.objects.get(pk=self.user.pk)
+        with self.assertNumQueries(0):
+            self.assertTrue(self.backend.has_perm(other_instance, "auth.add_group"))
+
+    def test_no_request_cache_outside_of_request(self):
+        self.backend.get_all_permissions(self.user)
+        other_instance = User.objects.get(pk=self.user.pk)
+        with self.assertNumQueries(2):
+            self.backend.get_all_permissions(other_instance)
+
+    def test_perms_graph_is_used(self):
+        ContentType.objects.get_for_id(self.add_group.content_type_id)  # warm content types cache
+        users = list(User.objects.with_perms_graph().filter(pk=self.user.pk))
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                self.backend.get_all_permissions(users[0]), {"auth.add_group", "auth.change_group"}
+            )
+
+
+class WithPermTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.add_group = Permission.objects.get(content_type__app_label="auth", codename="add_group")
+        group = Group.objects.create(name="editors")
+        group.permissions.add(cls.add_group)
+
+        cls.direct_user = User.objects.create_user("direct")
+        cls.direct_user.user_permissions.add(cls.add_group)
+        cls.group_user = User.objects.create_user("group")
+        cls.group_user.groups.add(group)
+        cls.inactive_user = User.objects.create_user("inactive", is_active=False)
+        cls.inactive_user.user_permissions.add(cls.add_group)
+        cls.superuser = User.objects.create_superuser("admin", "admin@example.com", "password")
+        User.objects.create_user("other")
+
+    def setUp(self):
+        self.backend = ModelBackend()
+
+    def test_with_perm(self):
+        self.assertCountEqual(
+            self.backend.with_perm("auth.add_group"),
+            [self.direct_user, self.group_user, self.superuser],
+        )
+
+    def test_with_perm_instance(self):
+        self.assertCountEqual(
+            self.backend.with_perm(self.add_group, include_superusers=False),
+            [self.direct_user, self.group_user],
+        )
+
+    def test_with_perm_inactive(self):
+        self.assertCountEqual(
+            self.backend.with_perm("auth.add_group", is_active=False),
+            [self.inactive_user],
+        )
+
+    def test_with_perm_takes_one_query(self):
+        with self.assertNumQueries(1):
+            list(self.backend.with_perm("auth.add_group"))
+
+    def test_with_perm_obj(self):
+        self.assertQuerySetEqual(self.backend.with_perm("auth.add_group", obj=self.direct_user), [])
+
+    def test_with_perm_invalid(self):
+        with self.assertRaises(ValueError):
+            self.backend.with_perm("add_group")
+        with self.assertRaises(TypeError):
+            self.backend.with_perm(1)
+
+
+class PermsToUsersLookupsTestCase(TestCase):
+    def test_custom_group_model(self):
+        add_group = Permission.objects.get(content_type__app_label="auth", codename="add_group")
+        change_group = Permission.objects.get(content_type__app_label="auth", codename="change_group")
+        team = Team.objects.create(name="editors", description="")
+        team.permissions.add(change_group)
+        user = TeamUser.objects.create(username="user")
+        user.groups.add(team)
+        user.user_permissions.add(add_group)
+
+        lookups = _get_perms_to_users_lookups(TeamUser)
+        self.assertEqual(lookups, {"user_permissions": "team_users", "groups": "teams__members"})
+        self.assertCountEqual(Permission.objects.filter(**{lookups["user_permissions"]: user.pk}), [add_group])
+        self.assertCountEqual(Permission.objects.filter(**{lookups["groups"]: user.pk}), [change_group])
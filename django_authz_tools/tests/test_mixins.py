@@ -0,0 +1,72 @@
+from django.contrib.auth.models import Group, Permission, PermissionsMixin
+from django.test import TestCase, override_settings
+
+from django_authz_tools.auth_backends import prefetch_user_perms
+from django_authz_tools.tests.testapp.models import GroupBasedUser, NoAccessControlUser
+
+
+class NoAccessControlMixinTestCase(TestCase):
+    def test_fields_are_deleted(self):
+        field_names = {field.name for field in NoAccessControlUser._meta.get_fields()}
+        self.assertNotIn("groups", field_names)
+        self.assertNotIn("user_permissions", field_names)
+
+    def test_only_active_superusers_have_permissions(self):
+        superuser = NoAccessControlUser.objects.create(username="admin", is_superuser=True)
+        inactive_superuser = NoAccessControlUser.objects.create(
+            username="inactive", is_superuser=True, is_active=False
+        )
+        user = NoAccessControlUser.objects.create(username="user")
+        self.assertIsNot(NoAccessControlUser.has_perm, PermissionsMixin.has_perm)
+        with self.assertNumQueries(0):
+            self.assertTrue(superuser.has_perm("auth.add_group"))
+            self.assertTrue(superuser.has_module_perms("auth"))
+            self.assertFalse(inactive_superuser.has_perms(["auth.add_group"]))
+            self.assertFalse(user.has_perm("auth.add_group"))
+
+    def test_prefetch_user_perms(self):
+        user = NoAccessControlUser.objects.create(username="user")
+        with self.assertNumQueries(0):
+            prefetch_user_perms(user)
+
+
+@override_settings(DEFAULT_STAFF_GROUP_NAME="staff", DEFAULT_SUPERUSER_GROUP_NAME="superusers")
+class GroupBasedMixinsTestCase(TestCase):
+    def test_create_superuser(self):
+        user = GroupBasedUser.objects.create_superuser("admin", "admin@example.com", "password")
+        user = GroupBasedUser.objects.get(pk=user.pk)
+        self.assertTrue(user.is_staff)
+        self.assertTrue(user.is_superuser)
+        self.assertCountEqual(user.groups.values_list("name", flat=True), ["staff", "superusers"])
+
+    def test_set_on_saved_user(self):
+        user = GroupBasedUser.objects.create(username="user")
+        self.assertFalse(user.is_staff)
+        user.is_staff = True
+        self.assertTrue(GroupBasedUser.objects.get(pk=user.pk).is_staff)
+        user.is_staff = False
+        self.assertFalse(GroupBasedUser.objects.get(pk=user.pk).is_staff)
+
+    def test_membership_is_cached(self):
+        user = GroupBasedUser.objects.create(username="user", is_staff=True)
+        user = GroupBasedUser.objects.get(pk=user.pk)
+        with self.assertNumQueries(1):
+            self.assertTrue(user.is_staff)
+            self.assertTrue(user.is_staff)
+
+    def test_prefetched_groups_are_used(self):
+        GroupBasedUser.objects.create(username="user", is_staff=True)
+        user = GroupBasedUser.objects.prefetch_related("groups").get()
+        with self.assertNumQueries(0):
+            self.assertTrue(user.is_staff)
+            self.assertFalse(user.is_superuser)
+
+    def test_prefetch_user_perms(self):
+        group = Group.objects.create(name="editors")
+        group.permissions.add(Permission.objects.get(content_type__app_label="auth", codename="add_group"))
+        user = GroupBasedUser.objects.create(username="user")
+        user.groups.add(group)
+        prefetch_user_perms(user)
+        with self.assertNumQueries(0):
+            self.assertTrue(user.has_perm("auth.add_group"))
+            self.assertFalse(user.has_perm("auth.change_group"))
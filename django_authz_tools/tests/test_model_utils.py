@@ -0,0 +1,46 @@
+from django.contrib.auth.models import Group, Permission
+from django.db import models
+from django.test import TestCase
+
+from django_authz_tools.exceptions import ModelIsNotAbstractException
+from django_authz_tools.helpers.model_utils import (
+    from_abstract_to_concrete_model,
+    get_group_model,
+    get_or_create_groups,
+    get_permission_model,
+)
+from django_authz_tools.models.base import BaseGroup
+from django_authz_tools.tests.testapp.models import Team
+
+
+class ModelUtilsTestCase(TestCase):
+    def test_get_models(self):
+        self.assertIs(get_group_model(), Group)
+        self.assertIs(get_permission_model(), Permission)
+
+    def test_get_or_create_groups(self):
+        Group.objects.create(name="existing")
+        with self.assertNumQueries(3):
+            groups = get_or_create_groups(["existing", "first", "second"])
+        self.assertCountEqual([group.name for group in groups], ["existing", "first", "second"])
+        self.assertEqual(Group.objects.count(), 3)
+
+    def test_group_manager_sync_by_natural_keys(self):
+        Team.objects.create(name="existing")
+        with self.assertNumQueries(3):
+            teams = list(Team.objects.sync_by_natural_keys(["existing", "first"]))
+        self.assertCountEqual([team.name for team in teams], ["existing", "first"])
+
+    def test_concrete_model_is_reused(self):
+        first = from_abstract_to_concrete_model(
+            BaseGroup, "ConcreteGroup", {"name": models.CharField(max_length=10)}, app_label="testapp"
+        )
+        second = from_abstract_to_concrete_model(
+            BaseGroup, "ConcreteGroup", {"name": models.CharField(max_length=10)}, app_label="testapp"
+        )
+        self.assertIs(first, second)
+        self.assertFalse(first._meta.abstract)
+
+    def test_concrete_model_is_rejected(self):
+        with self.assertRaises(ModelIsNotAbstractException):
+            from_abstract_to_concrete_model(Group, "ConcreteGroup")
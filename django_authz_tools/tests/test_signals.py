@@ -0,0 +1,147 @@
+from django.contrib.auth.models import Group, Permission
+from django.core.signals import request_finished, request_started
+from django.test import TestCase, override_settings
+
+from django_authz_tools.auth_backends import ModelBackend
+from django_authz_tools.tests.testapp.models import User
+
+
+class PermCacheInvalidationTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.add_group = Permission.objects.get(content_type__app_label="auth", codename="add_group")
+
+    def setUp(self):
+        self.user = User.objects.create_user("user")
+        self.group = Group.objects.create(name="editors")
+
+    def test_user_permissions_changed(self):
+        self.assertFalse(self.user.has_perm("auth.add_group"))
+        self.user.user_permissions.add(self.add_group)
+        self.assertTrue(self.user.has_perm("auth.add_group"))
+
+    def test_user_groups_changed(self):
+        self.group.permissions.add(self.add_group)
+        self.assertFalse(self.user.has_perm("auth.add_group"))
+        self.user.groups.add(self.group)
+        self.assertTrue(self.user.has_perm("auth.add_group"))
+
+    def test_group_permissions_changed_during_request(self):
+        request_started.send(sender=None)
+        self.addCleanup(request_finished.send, sender=None)
+        self.user.groups.add(self.group)
+        self.assertFalse(User.objects.get(pk=self.user.pk).has_perm("auth.add_group"))
+        self.group.permissions.add(self.add_group)
+        self.assertTrue(User.objects.get(pk=self.user.pk).has_perm("auth.add_group"))
+
+
+class EffectivePermsTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.add_group = Permission.objects.get(content_type__app_label="auth", codename="add_group")
+        cls.change_group = Permission.objects.get(content_type__app_label="auth", codename="change_group")
+
+    def setUp(self):
+        self.backend = ModelBackend()
+        self.user = User.objects.create_user("user")
+        self.group = Group.objects.create(name="editors")
+
+    def assertEffectivePerms(self, user, perms):
+        self.assertEqual(User.objects.get(pk=user.pk).effective_perms, perms)
+
+    def test_user_permissions_changed(self):
+        self.user.user_permissions.add(self.add_group)
+        self.assertEffectivePerms(self.user, ["auth.add_group"])
+        self.user.user_permissions.remove(self.add_group)
+        self.assertEffectivePerms(self.user, [])
+
+    def test_user_groups_changed(self):
+        self.group.permissions.add(self.change_group)
+        self.user.groups.add(self.group)
+        self.assertEffectivePerms(self.user, ["auth.change_group"])
+        self.user.groups.clear()
+        self.assertEffectivePerms(self.user, [])
+
+    def test_group_permissions_changed(self):
+        self.user.groups.add(self.group)
+        self.group.permissions.add(self.change_group)
+        self.assertEffectivePerms(self.user, ["auth.change_group"])
+        self.change_group.group_set.clear()
+        self.assertEffectivePerms(self.user, [])
+
+    def test_group_users_cleared(self):
+        self.group.permissions.add(self.change_group)
+        self.user.groups.add(self.group)
+        self.group.user_set.clear()
+        self.assertEffectivePerms(self.user, [])
+
+    def test_group_deleted(self):
+        self.group.permissions.add(self.add_group)
+        self.user.groups.add(self.group)
+        self.group.delete()
+        self.assertEffectivePerms(self.user, [])
+        self.assertFalse(User.objects.get(pk=self.user.pk).has_perm("auth.add_group"))
+
+    def test_permission_deleted(self):
+        permission = Permission.objects.create(
+            content_type=self.add_group.content_type, codename="temporary", name="Temporary"
+        )
+        self.user.user_permissions.add(permission, self.add_group)
+        self.group.permissions.add(permission)
+        other_user = User.objects.create_user("other")
+        other_user.groups.add(self.group)
+        permission.delete()
+        self.assertEffectivePerms(self.user, ["auth.add_group"])
+        self.assertEffectivePerms(other_user, [])
+
+    def test_permission_renamed(self):
+        permission = Permission.objects.create(
+            content_type=self.add_group.content_type, codename="temporary", name="Temporary"
+        )
+        self.user.user_permissions.add(permission)
+        other_user = User.objects.create_user("other")
+        other_user.groups.add(self.group)
+        self.group.permissions.add(permission)
+        permission.codename = "renamed"
+        permission.save()
+        self.assertEffectivePerms(self.user, ["auth.renamed"])
+        self.assertEffectivePerms(other_user, ["auth.renamed"])
+
+    def test_group_users_refreshed_in_bulk(self):
+        users = [User.objects.create_user(f"user{i}") for i in range(5)]
+        self.group.user_set.add(*users)
+        self.user.user_permissions.add(self.add_group)
+        self.user.groups.add(self.group)
+        # Affected users, their permissions from both relations, one UPDATE.
+        with self.assertNumQueries(6):
+            self.group.permissions.add(self.change_group)
+        for user in users:
+            self.assertEffectivePerms(user, ["auth.change_group"])
+        self.assertEffectivePerms(self.user, ["auth.add_group", "auth.change_group"])
+
+    def test_permission_checks_are_answered_from_user_row(self):
+        self.user.user_permissions.add(self.add_group)
+        user = User.objects.get(pk=self.user.pk)
+        with self.assertNumQueries(0):
+            self.assertTrue(user.has_perm("auth.add_group"))
+            self.assertFalse(user.has_perm("auth.change_group"))
+
+    def test_cached_permissions_are_invalidated(self):
+        self.assertFalse(self.user.has_perm("auth.add_group"))
+        self.user.user_permissions.add(self.add_group)
+        self.assertTrue(self.user.has_perm("auth.add_group"))
+
+    @override_settings(AUTHZ_PERM_FILTER=["contenttypes"])
+    def test_filtered_perms_graph(self):
+        self.group.permissions.add(self.add_group)
+        user = User.objects.with_perms_graph().get(pk=self.user.pk)
+        self.assertEqual(user.filtered_user_permissions, [])
+        user.groups.add(self.group)
+        self.assertEffectivePerms(user, ["auth.add_group"])
+        self.assertTrue(user.has_perm("auth.add_group"))
+
+    @override_settings(AUTHZ_PERM_FILTER="auth")
+    def test_perms_graph_filtered_by_single_app_label(self):
+        self.user.user_permissions.add(self.add_group)
+        user = User.objects.with_perms_graph().get(pk=self.user.pk)
+        self.assertEqual(user.filtered_user_permissions, [self.add_group])
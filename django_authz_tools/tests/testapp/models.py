@@ -0,0 +1,34 @@
+from django.contrib.auth.models import Group, Permission, PermissionsMixin
+from django.db import models
+
+from django_authz_tools.models.base import BaseGroup, CustomAbstractBaseUser
+from django_authz_tools.models.impls.ac_2d import AbstractUser
+from django_authz_tools.models.managers import PrefetchUserManager
+from django_authz_tools.models.mixins import (
+    GroupBasedStaffMixin,
+    GroupBasedSuperuserMixin,
+    NoAccessControlMixin,
+    NoUserPermissionsMixin,
+)
+
+
+class User(AbstractUser):
+    objects = PrefetchUserManager()
+
+
+class NoAccessControlUser(CustomAbstractBaseUser, NoAccessControlMixin):
+    pass
+
+
+class GroupBasedUser(GroupBasedStaffMixin, GroupBasedSuperuserMixin, CustomAbstractBaseUser, NoUserPermissionsMixin):
+    groups = models.ManyToManyField(Group, blank=True, related_name="group_based_users")
+
+
+class Team(BaseGroup):
+    name = models.CharField(max_length=150, unique=True)
+    permissions = models.ManyToManyField(Permission, blank=True, related_name="teams")
+
+
+class TeamUser(CustomAbstractBaseUser, PermissionsMixin):
+    groups = models.ManyToManyField(Team, blank=True, related_name="members")
+    user_permissions = models.ManyToManyField(Permission, blank=True, related_name="team_users")